@@ -3,21 +3,50 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from flask_cors import CORS
 from config import Config
+from app.engine_profiles import init_engine_profile, configure_sqlite_pragmas
 
 db = SQLAlchemy()
 migrate = Migrate()
 
-def create_app():
+APP_MODES = {'full', 'api'}
+
+def create_app(mode=None):
+    """Create the app. mode='api' serves read-only GET routes and skips the PDF/AI extraction stack."""
     app = Flask(__name__)
     app.config.from_object(Config)
     
+    mode = mode or app.config['APP_MODE']
+    if mode not in APP_MODES:
+        raise ValueError(f"APP_MODE must be one of {sorted(APP_MODES)}, got {mode!r}")
+    app.config['APP_MODE'] = mode
+    
+    # Engine options must be in place before the engine is created
+    profile = init_engine_profile(app)
+    
     # Initialize extensions
     db.init_app(app)
+    if profile == 'sqlite':
+        with app.app_context():
+            configure_sqlite_pragmas(db.engine, app.config)
     migrate.init_app(app, db)
     CORS(app)
     
+    from app.cli import export_command, import_command
+    app.cli.add_command(export_command)
+    app.cli.add_command(import_command)
+    
     # Register blueprints
-    from app.routes import bp as main_bp
+    from app.routes import bp as main_bp, edit_bp
     app.register_blueprint(main_bp)
     
+    from app.bulk_routes import bp as bulk_bp, import_bp
+    app.register_blueprint(bulk_bp)
+    
+    if mode == 'full':
+        app.register_blueprint(edit_bp)
+        app.register_blueprint(import_bp)
+        
+        from app.upload_routes import bp as upload_bp
+        app.register_blueprint(upload_bp)
+    
     return app
\ No newline at end of file
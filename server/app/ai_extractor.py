@@ -1,12 +1,28 @@
 import requests
 import json
+import re
 import logging
-from datetime import datetime
-from dateutil import parser
 from flask import current_app
+from app.response_parser import parse_json_response, validate_agreement_data, AGREEMENT_SCHEMA
 
 logger = logging.getLogger(__name__)
 
+# Cap on document text sent with a follow-up request for missing fields
+MAX_FOLLOW_UP_CHARS = 6000
+
+FIELD_KEYWORDS = {
+    'vendor': ['vendor', 'supplier', 'provider', 'seller', 'between'],
+    'buyer': ['buyer', 'customer', 'client', 'purchaser', 'between'],
+    'order_date': ['order date', 'dated', 'date of order'],
+    'effective_date': ['effective', 'commence', 'start date'],
+    'end_date': ['end date', 'expir', 'terminat', 'until'],
+    'term_length_months': ['term', 'months', 'year'],
+    'total_value': ['total', 'amount', 'fee', 'price', '$'],
+    'important_dates': ['renew', 'notice', 'expir', 'terminat'],
+    'renewal_terms': ['renew', 'notice', 'terminat', 'cancel'],
+    'products': ['product', 'service', 'license', 'quantity', 'qty', 'unit', 'subscription'],
+}
+
 def extract_agreement_data(pdf_text):
     """Use OpenRouter API to extract structured data from PDF text"""
     
@@ -32,6 +48,22 @@ Required fields:
       "recurrence_interval_months": number or null
     }}
   ]
+- renewal_terms: Renewal and cancellation terms:
+  {{
+    "auto_renewal": true/false,
+    "notice_period_days": number of days notice required to cancel or not renew, or null,
+    "notice_description": "The notice clause as written" or null
+  }}
+- products: Array of line items:
+  [
+    {{
+      "product_name": "Name of product or service",
+      "quantity": number or null,
+      "unit_price": number or null,
+      "total_price": number or null,
+      "term_months": number or null
+    }}
+  ]
 
 For auto-renewal contracts, calculate both the renewal date AND the notice deadline.
 For example, if a contract renews on Jan 15, 2027 but requires 90 days notice, 
@@ -43,6 +75,27 @@ Document text:
 Return only valid JSON, no other text.
 """
 
+    ai_response = _call_openrouter(prompt)
+    if ai_response is None:
+        return {}
+
+    try:
+        raw_data = parse_json_response(ai_response)
+    except ValueError as e:
+        logger.error(f"Could not parse AI response: {str(e)}")
+        raw_data = {}
+
+    extracted_data, missing = validate_agreement_data(raw_data)
+
+    if missing:
+        logger.info(f"Re-requesting missing fields: {missing}")
+        extracted_data.update(_request_missing_fields(pdf_text, extracted_data, missing))
+
+    logger.info(f"Successfully extracted data: {extracted_data}")
+    return extracted_data
+
+def _call_openrouter(prompt):
+    """Send a single-message prompt to OpenRouter and return the reply text"""
     try:
         response = requests.post(
             "https://openrouter.ai/api/v1/chat/completions",
@@ -59,34 +112,75 @@ Return only valid JSON, no other text.
         
         if response.status_code != 200:
             logger.error(f"OpenRouter API error: {response.status_code} - {response.text}")
-            return {}
+            return None
         
         result = response.json()
-        ai_response = result['choices'][0]['message']['content']
-        
-        # Parse the JSON response
-        extracted_data = json.loads(ai_response)
-        
-        # Convert date strings to date objects
-        date_fields = ['order_date', 'effective_date', 'end_date']
-        for field in date_fields:
-            if extracted_data.get(field):
-                try:
-                    extracted_data[field] = parser.parse(extracted_data[field]).date()
-                except:
-                    extracted_data[field] = None
-        
-        # Convert important_dates
-        if 'important_dates' in extracted_data:
-            for date_info in extracted_data['important_dates']:
-                try:
-                    date_info['date'] = parser.parse(date_info['date']).date()
-                except:
-                    continue
-        
-        logger.info(f"Successfully extracted data: {extracted_data}")
-        return extracted_data
+        return result['choices'][0]['message']['content']
         
     except Exception as e:
         logger.error(f"Error extracting data with AI: {str(e)}")
-        return {}
\ No newline at end of file
+        return None
+
+def find_relevant_excerpts(pdf_text, fields, max_chars=MAX_FOLLOW_UP_CHARS):
+    """Return the paragraphs of the document that mention the given fields"""
+    keywords = set()
+    for field in fields:
+        keywords.update(FIELD_KEYWORDS.get(field, []))
+
+    excerpts = []
+    total = 0
+    for paragraph in re.split(r'\n\s*\n|\\n', pdf_text):
+        lowered = paragraph.lower()
+        if not any(keyword in lowered for keyword in keywords):
+            continue
+        if total + len(paragraph) > max_chars:
+            break
+        excerpts.append(paragraph.strip())
+        total += len(paragraph)
+
+    # Parties and dates are usually stated up front
+    if not excerpts:
+        excerpts.append(pdf_text[:max_chars])
+
+    return "\n...\n".join(excerpts)
+
+def _request_missing_fields(pdf_text, extracted_data, missing):
+    """Ask the model for just the fields the first pass did not return"""
+    known = {field: value for field, value in extracted_data.items()
+             if field not in ('important_dates', 'renewal_terms', 'products') and value is not None}
+
+    prompt = f"""
+A previous extraction from a purchase agreement returned these fields:
+{json.dumps(known, default=str)}
+
+The following fields were missing or invalid: {", ".join(missing)}
+
+Using the excerpts below, return JSON containing only those fields, using the
+same formats as before (dates as YYYY-MM-DD, numbers without currency symbols,
+important_dates as an array of objects with type, date, description,
+is_recurring and recurrence_interval_months, renewal_terms as an object with
+auto_renewal, notice_period_days and notice_description, products as an array
+of objects with product_name, quantity, unit_price, total_price and
+term_months). Use null for anything the excerpts do not state.
+
+Document excerpts:
+{find_relevant_excerpts(pdf_text, missing)}
+
+Return only valid JSON, no other text.
+"""
+
+    ai_response = _call_openrouter(prompt)
+    if ai_response is None:
+        return {}
+
+    try:
+        raw_data = parse_json_response(ai_response)
+    except ValueError as e:
+        logger.error(f"Could not parse follow-up AI response: {str(e)}")
+        return {}
+
+    schema = {field: AGREEMENT_SCHEMA[field] for field in missing}
+    recovered, still_missing = validate_agreement_data(raw_data, schema)
+    if still_missing:
+        logger.warning(f"Fields still missing after follow-up: {still_missing}")
+    return recovered
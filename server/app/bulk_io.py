@@ -0,0 +1,303 @@
+import json
+import logging
+import os
+from datetime import date, datetime
+from decimal import Decimal
+from itertools import groupby
+from sqlalchemy import Boolean, Date, DateTime, Integer, Numeric, String, bindparam, insert, select
+from sqlalchemy.exc import IntegrityError
+from app import db
+from app.models import Agreement, AgreementDate, Product, RenewalTerm
+
+logger = logging.getLogger(__name__)
+
+# Parents before children so foreign keys resolve on import
+TABLES = {
+    'agreements': Agreement.__table__,
+    'agreement_dates': AgreementDate.__table__,
+    'products': Product.__table__,
+    'renewal_terms': RenewalTerm.__table__,
+}
+
+FORMATS = {'ndjson', 'parquet'}
+
+DEFAULT_CHUNK_SIZE = 5000
+
+class BulkImportError(Exception):
+    """An import that stopped partway. Chunks flushed before the failure stay committed."""
+
+    def __init__(self, message, committed, invalid_input=False):
+        super().__init__(message)
+        self.committed = committed
+        self.invalid_input = invalid_input
+
+def _to_json_value(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+def _from_json_value(column, value):
+    """Convert an exported value back to the Python type the column expects"""
+    if value is None:
+        return None
+    column_type = column.type
+    if isinstance(column_type, DateTime):
+        return value if isinstance(value, datetime) else datetime.fromisoformat(value)
+    if isinstance(column_type, Date):
+        if isinstance(value, datetime):
+            return value.date()
+        return value if isinstance(value, date) else date.fromisoformat(value)
+    if isinstance(column_type, Numeric):
+        return value if isinstance(value, Decimal) else Decimal(str(value))
+    if isinstance(column_type, Boolean):
+        if isinstance(value, bool):
+            return value
+        if isinstance(value, str) and value.lower() in ('true', 'false'):
+            return value.lower() == 'true'
+        if value in (0, 1):
+            return bool(value)
+        raise ValueError('expected boolean')
+    if isinstance(column_type, Integer):
+        if isinstance(value, bool) or (isinstance(value, float) and not value.is_integer()):
+            raise ValueError('expected integer')
+        return int(value)
+    if isinstance(column_type, String) and not isinstance(value, str):
+        raise ValueError('expected string')
+    return value
+
+def _coerce_row(table, row):
+    """Validate an imported row and convert it to column types, raising ValueError if it is bad"""
+    if not isinstance(row, dict):
+        raise ValueError('row must be an object')
+    if not isinstance(row.get('id'), str) or not row['id']:
+        raise ValueError('row must have a string id')
+
+    unknown = set(row) - set(table.columns.keys())
+    if unknown:
+        raise ValueError(f"unknown columns for {table.name}: {sorted(unknown)}")
+
+    coerced = {}
+    for name, value in row.items():
+        column = table.columns[name]
+        try:
+            coerced[name] = _from_json_value(column, value)
+        except (ValueError, TypeError, ArithmeticError) as e:
+            raise ValueError(f"invalid {name} {value!r}: {str(e)}")
+        if coerced[name] is None and not column.nullable:
+            raise ValueError(f"{name} cannot be null")
+    return coerced
+
+def iter_table_chunks(connection, table, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield lists of row dicts from a table without loading it all into memory"""
+    result = connection.execution_options(yield_per=chunk_size).execute(
+        table.select().order_by(table.c.id)
+    )
+    for partition in result.mappings().partitions():
+        yield partition
+
+def iter_ndjson_export(chunk_size=DEFAULT_CHUNK_SIZE, tables=None):
+    """Yield NDJSON lines of {"table": ..., "row": {...}} for every exported row"""
+    with db.engine.connect() as connection:
+        for name in tables or TABLES:
+            table = TABLES[name]
+            for chunk in iter_table_chunks(connection, table, chunk_size):
+                yield ''.join(
+                    json.dumps({'table': name, 'row': {key: _to_json_value(value) for key, value in row.items()}}) + '\n'
+                    for row in chunk
+                )
+
+def _arrow_schema(table):
+    import pyarrow as pa
+
+    fields = []
+    for column in table.columns:
+        column_type = column.type
+        if isinstance(column_type, DateTime):
+            arrow_type = pa.timestamp('us')
+        elif isinstance(column_type, Date):
+            arrow_type = pa.date32()
+        elif isinstance(column_type, Numeric):
+            arrow_type = pa.decimal128(column_type.precision or 38, column_type.scale or 0)
+        elif isinstance(column_type, Boolean):
+            arrow_type = pa.bool_()
+        elif isinstance(column_type, Integer):
+            arrow_type = pa.int64()
+        else:
+            arrow_type = pa.string()
+        fields.append(pa.field(column.name, arrow_type, nullable=column.nullable))
+    return pa.schema(fields)
+
+def write_parquet_table(name, sink, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Write one table to a Parquet file or stream, one row group per chunk"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    table = TABLES[name]
+    schema = _arrow_schema(table)
+    count = 0
+
+    with db.engine.connect() as connection, pq.ParquetWriter(sink, schema) as writer:
+        for chunk in iter_table_chunks(connection, table, chunk_size):
+            writer.write_table(pa.Table.from_pylist([dict(row) for row in chunk], schema=schema))
+            count += len(chunk)
+
+    return count
+
+def export_parquet(directory, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Export every table to <directory>/<table>.parquet"""
+    os.makedirs(directory, exist_ok=True)
+    counts = {}
+    for name in TABLES:
+        counts[name] = write_parquet_table(name, os.path.join(directory, f"{name}.parquet"), chunk_size)
+    return counts
+
+def _upsert(connection, table, rows):
+    """Insert rows, updating only the supplied columns of any existing row with the same id.
+
+    All rows must carry the same set of columns.
+    """
+    columns = [name for name in rows[0] if name != 'id']
+    dialect = connection.dialect.name
+
+    # NOT NULL is checked on the proposed insert before ON CONFLICT applies, so rows missing a
+    # required column take the update-then-insert path below and only touch the columns they carry
+    complete = all(column.name in rows[0] for column in table.columns
+                   if not column.nullable and column.default is None and column.server_default is None)
+
+    if complete and dialect in ('sqlite', 'postgresql'):
+        if dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        statement = dialect_insert(table)
+        if columns:
+            statement = statement.on_conflict_do_update(
+                index_elements=[table.c.id],
+                set_={name: statement.excluded[name] for name in columns}
+            )
+        else:
+            statement = statement.on_conflict_do_nothing(index_elements=[table.c.id])
+        connection.execute(statement, rows)
+        return
+
+    existing = set(connection.execute(
+        select(table.c.id).where(table.c.id.in_([row['id'] for row in rows]))
+    ).scalars())
+
+    updates = [row for row in rows if row['id'] in existing]
+    if updates and columns:
+        statement = table.update().where(table.c.id == bindparam('_id')).values(
+            {name: bindparam(f'_{name}') for name in columns}
+        )
+        connection.execute(statement, [
+            {'_id': row['id'], **{f'_{name}': row[name] for name in columns}} for row in updates
+        ])
+
+    inserts = [row for row in rows if row['id'] not in existing]
+    if inserts:
+        connection.execute(insert(table), inserts)
+
+class BulkImporter:
+    """Buffers incoming rows per table and upserts them in chunks.
+
+    Each flush is its own transaction, so counts only ever reflect committed rows.
+    """
+
+    def __init__(self, connection, chunk_size=DEFAULT_CHUNK_SIZE):
+        self.connection = connection
+        self.chunk_size = chunk_size
+        self.buffers = {name: [] for name in TABLES}
+        self.counts = {name: 0 for name in TABLES}
+
+    def add(self, name, row):
+        if name not in TABLES:
+            raise ValueError(f"Unknown table {name!r}")
+        self.buffers[name].append(_coerce_row(TABLES[name], row))
+        if len(self.buffers[name]) >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        # Flush every buffer in parent-first order so children never land before their agreement
+        pending = {}
+        for name, rows in self.buffers.items():
+            if not rows:
+                continue
+            # Rows with the same columns go out together so partial rows only update what they carry
+            for _, group in groupby(rows, key=lambda row: tuple(sorted(row))):
+                _upsert(self.connection, TABLES[name], list(group))
+            pending[name] = len(rows)
+            self.buffers[name] = []
+        self.connection.commit()
+
+        for name, count in pending.items():
+            self.counts[name] += count
+
+def _import_failed(connection, importer, error):
+    connection.rollback()
+    logger.error(f"Import failed, rows committed before the failure: {importer.counts}")
+    # Report the driver's message, not the SQL statement and its parameters
+    message = str(getattr(error, 'orig', None) or error)
+    return BulkImportError(message, dict(importer.counts),
+                           invalid_input=isinstance(error, (ValueError, IntegrityError)))
+
+def import_ndjson(lines, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Upsert rows from an iterable of NDJSON lines, returning counts per table.
+
+    Not atomic: each chunk commits as it is flushed. On failure a BulkImportError
+    carries the counts already committed; rerunning the same input is safe.
+    """
+    with db.engine.connect() as connection:
+        importer = BulkImporter(connection, chunk_size)
+        try:
+            for line_number, line in enumerate(lines, 1):
+                if isinstance(line, bytes):
+                    line = line.decode('utf-8')
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                    if not isinstance(record, dict):
+                        raise ValueError('record must be an object')
+                    importer.add(record.get('table'), record.get('row'))
+                except ValueError as e:
+                    raise ValueError(f"Invalid record on line {line_number}: {str(e)}")
+            importer.flush()
+        except Exception as e:
+            raise _import_failed(connection, importer, e) from e
+    logger.info(f"Imported NDJSON: {importer.counts}")
+    return importer.counts
+
+def import_parquet_table(name, source, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Upsert one table from a Parquet file or stream, one record batch at a time"""
+    import pyarrow.parquet as pq
+
+    if name not in TABLES:
+        raise ValueError(f"Unknown table {name!r}")
+
+    with db.engine.connect() as connection:
+        importer = BulkImporter(connection, chunk_size)
+        try:
+            for batch in pq.ParquetFile(source).iter_batches(batch_size=chunk_size):
+                for row in batch.to_pylist():
+                    importer.add(name, row)
+            importer.flush()
+        except Exception as e:
+            raise _import_failed(connection, importer, e) from e
+    return importer.counts[name]
+
+def import_parquet(directory, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Import every <table>.parquet found in directory, parents first"""
+    counts = {}
+    for name in TABLES:
+        path = os.path.join(directory, f"{name}.parquet")
+        if not os.path.exists(path):
+            continue
+        try:
+            counts[name] = import_parquet_table(name, path, chunk_size)
+        except BulkImportError as e:
+            # Tables imported before this one are committed too
+            raise BulkImportError(f"{name}: {str(e)}", {**counts, **e.committed}, e.invalid_input) from e
+    logger.info(f"Imported Parquet: {counts}")
+    return counts
@@ -0,0 +1,87 @@
+from flask import Blueprint, Response, request, jsonify, current_app, send_file, stream_with_context
+from werkzeug.exceptions import RequestEntityTooLarge
+from app.bulk_io import (FORMATS, TABLES, BulkImportError, iter_ndjson_export, write_parquet_table,
+                         import_ndjson, import_parquet_table)
+import shutil
+import tempfile
+
+bp = Blueprint('bulk', __name__)
+# Writes, registered only in 'full' mode
+import_bp = Blueprint('bulk_import', __name__)
+
+TOO_LARGE_MESSAGE = 'Import body exceeds MAX_CONTENT_LENGTH; use `flask import` for large restores'
+
+def _bulk_params():
+    fmt = request.args.get('format', 'ndjson')
+    if fmt not in FORMATS:
+        raise ValueError(f"format must be one of {sorted(FORMATS)}")
+
+    table = request.args.get('table')
+    if table and table not in TABLES:
+        raise ValueError(f"table must be one of {list(TABLES)}")
+    if fmt == 'parquet' and not table:
+        raise ValueError('Parquet requires a table parameter')
+    return fmt, table
+
+@bp.route('/export', methods=['GET'])
+def export_data():
+    """Stream all agreements and related rows as NDJSON, or one table as Parquet"""
+    try:
+        fmt, table = _bulk_params()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    try:
+        if fmt == 'ndjson':
+            tables = [table] if table else None
+            return Response(stream_with_context(iter_ndjson_export(tables=tables)),
+                            mimetype='application/x-ndjson',
+                            headers={'Content-Disposition': 'attachment; filename=agreements.ndjson'})
+
+        # Parquet needs a seekable sink, so spool to an anonymous temp file
+        sink = tempfile.TemporaryFile()
+        write_parquet_table(table, sink)
+        sink.seek(0)
+        return send_file(sink, mimetype='application/vnd.apache.parquet',
+                         as_attachment=True, download_name=f"{table}.parquet")
+
+    except Exception as e:
+        current_app.logger.error(f"Export error: {str(e)}")
+        return jsonify({'error': 'Failed to export data'}), 500
+
+@import_bp.route('/import', methods=['POST'])
+def import_data():
+    """Upsert rows from an NDJSON body, or one table from a Parquet body.
+
+    For small payloads only: the body is capped by MAX_CONTENT_LENGTH, so full
+    restores go through `flask import`. Not atomic: chunks committed before a
+    failure stay in place and are reported under 'committed'.
+    """
+    try:
+        fmt, table = _bulk_params()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    try:
+        if fmt == 'ndjson':
+            counts = import_ndjson(request.stream)
+        else:
+            with tempfile.TemporaryFile() as source:
+                shutil.copyfileobj(request.stream, source)
+                source.seek(0)
+                counts = {table: import_parquet_table(table, source)}
+
+        return jsonify({'message': 'Import completed', 'counts': counts}), 200
+
+    except RequestEntityTooLarge:
+        return jsonify({'error': TOO_LARGE_MESSAGE}), 413
+    except BulkImportError as e:
+        if isinstance(e.__cause__, RequestEntityTooLarge):
+            return jsonify({'error': TOO_LARGE_MESSAGE, 'committed': e.committed}), 413
+        if e.invalid_input:
+            return jsonify({'error': str(e), 'committed': e.committed}), 400
+        current_app.logger.error(f"Import error: {str(e)}")
+        return jsonify({'error': 'Failed to import data', 'committed': e.committed}), 500
+    except Exception as e:
+        current_app.logger.error(f"Import error: {str(e)}")
+        return jsonify({'error': 'Failed to import data'}), 500
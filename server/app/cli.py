@@ -0,0 +1,57 @@
+import sys
+import click
+from flask.cli import with_appcontext
+
+@click.command('export')
+@click.option('--format', 'fmt', type=click.Choice(['ndjson', 'parquet']), default='ndjson', show_default=True)
+@click.option('--output', '-o', default='-', show_default=True,
+              help="NDJSON file ('-' for stdout), or a directory for Parquet")
+@click.option('--chunk-size', type=int, default=5000, show_default=True)
+@with_appcontext
+def export_command(fmt, output, chunk_size):
+    """Export agreements, dates, products and renewal terms."""
+    from app.bulk_io import iter_ndjson_export, export_parquet
+
+    if fmt == 'parquet':
+        if output == '-':
+            raise click.UsageError('Parquet export needs an --output directory')
+        counts = export_parquet(output, chunk_size)
+        click.echo(f"Exported {counts} to {output}", err=True)
+        return
+
+    out = sys.stdout if output == '-' else open(output, 'w', encoding='utf-8')
+    try:
+        for lines in iter_ndjson_export(chunk_size):
+            out.write(lines)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+@click.command('import')
+@click.option('--format', 'fmt', type=click.Choice(['ndjson', 'parquet']), default='ndjson', show_default=True)
+@click.option('--input', '-i', 'source', default='-', show_default=True,
+              help="NDJSON file ('-' for stdin), or a directory of <table>.parquet files")
+@click.option('--chunk-size', type=int, default=5000, show_default=True)
+@with_appcontext
+def import_command(fmt, source, chunk_size):
+    """Import an export, upserting rows by id.
+
+    Not atomic: each chunk is committed as it is written, so a failure leaves
+    the chunks before it in place. Rerunning the same input is safe.
+    """
+    from app.bulk_io import BulkImportError, import_ndjson, import_parquet
+
+    try:
+        if fmt == 'parquet':
+            if source == '-':
+                raise click.UsageError('Parquet import needs an --input directory')
+            counts = import_parquet(source, chunk_size)
+        elif source == '-':
+            counts = import_ndjson(sys.stdin, chunk_size)
+        else:
+            with open(source, encoding='utf-8') as f:
+                counts = import_ndjson(f, chunk_size)
+    except BulkImportError as e:
+        raise click.ClickException(f"{str(e)}\nRows committed before the failure: {e.committed}")
+
+    click.echo(f"Imported {counts}", err=True)
@@ -0,0 +1,94 @@
+import logging
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+PROFILES = {'auto', 'sqlite', 'postgres'}
+SQLITE_JOURNAL_MODES = {'WAL', 'DELETE', 'TRUNCATE', 'PERSIST', 'MEMORY', 'OFF'}
+SQLITE_SYNCHRONOUS_MODES = {'OFF', 'NORMAL', 'FULL', 'EXTRA'}
+
+def normalize_database_uri(uri):
+    """Rewrite the legacy postgres:// scheme that SQLAlchemy no longer accepts"""
+    if uri.startswith('postgres://'):
+        return 'postgresql://' + uri[len('postgres://'):]
+    return uri
+
+def resolve_profile(config):
+    """Return the engine profile for this config, validating it against the database URI"""
+    profile = (config.get('DB_PROFILE') or 'auto').lower()
+    if profile not in PROFILES:
+        raise ValueError(f"DB_PROFILE must be one of {sorted(PROFILES)}, got {profile!r}")
+
+    uri = config['SQLALCHEMY_DATABASE_URI']
+    if uri.startswith('sqlite'):
+        detected = 'sqlite'
+    elif uri.startswith('postgresql'):
+        detected = 'postgres'
+    else:
+        detected = None
+
+    if profile == 'auto':
+        return detected
+    if profile != detected:
+        raise ValueError(f"DB_PROFILE={profile!r} does not match SQLALCHEMY_DATABASE_URI scheme")
+    return profile
+
+def _require_positive_int(config, key, allow_zero=False):
+    value = config[key]
+    if isinstance(value, bool) or not isinstance(value, int) or value < 0 or (value == 0 and not allow_zero):
+        raise ValueError(f"{key} must be a {'non-negative' if allow_zero else 'positive'} integer, got {value!r}")
+    return value
+
+def build_engine_options(config, profile):
+    """Build SQLALCHEMY_ENGINE_OPTIONS for the given profile"""
+    options = dict(config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+
+    if profile == 'sqlite':
+        if config['SQLITE_JOURNAL_MODE'].upper() not in SQLITE_JOURNAL_MODES:
+            raise ValueError(f"SQLITE_JOURNAL_MODE must be one of {sorted(SQLITE_JOURNAL_MODES)}")
+        if config['SQLITE_SYNCHRONOUS'].upper() not in SQLITE_SYNCHRONOUS_MODES:
+            raise ValueError(f"SQLITE_SYNCHRONOUS must be one of {sorted(SQLITE_SYNCHRONOUS_MODES)}")
+        _require_positive_int(config, 'SQLITE_BUSY_TIMEOUT_MS', allow_zero=True)
+        _require_positive_int(config, 'SQLITE_MMAP_SIZE', allow_zero=True)
+
+    elif profile == 'postgres':
+        options.setdefault('pool_size', _require_positive_int(config, 'PG_POOL_SIZE'))
+        options.setdefault('max_overflow', _require_positive_int(config, 'PG_MAX_OVERFLOW', allow_zero=True))
+        options.setdefault('pool_timeout', _require_positive_int(config, 'PG_POOL_TIMEOUT'))
+        options.setdefault('pool_recycle', _require_positive_int(config, 'PG_POOL_RECYCLE'))
+        options.setdefault('pool_pre_ping', bool(config['PG_POOL_PRE_PING']))
+
+        statement_timeout = _require_positive_int(config, 'PG_STATEMENT_TIMEOUT_MS', allow_zero=True)
+        connect_args = dict(options.get('connect_args') or {})
+        pg_options = connect_args.get('options', '')
+        connect_args['options'] = f"{pg_options} -c statement_timeout={statement_timeout}".strip()
+        options['connect_args'] = connect_args
+
+    return options
+
+def configure_sqlite_pragmas(engine, config):
+    """Apply the SQLite pragmas on every new DBAPI connection"""
+    pragmas = [
+        f"PRAGMA journal_mode={config['SQLITE_JOURNAL_MODE'].upper()}",
+        f"PRAGMA synchronous={config['SQLITE_SYNCHRONOUS'].upper()}",
+        f"PRAGMA busy_timeout={int(config['SQLITE_BUSY_TIMEOUT_MS'])}",
+        f"PRAGMA mmap_size={int(config['SQLITE_MMAP_SIZE'])}",
+    ]
+
+    @event.listens_for(engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+def init_engine_profile(app):
+    """Validate the configured profile and set engine options before the engine is created"""
+    app.config['SQLALCHEMY_DATABASE_URI'] = normalize_database_uri(app.config['SQLALCHEMY_DATABASE_URI'])
+    profile = resolve_profile(app.config)
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = build_engine_options(app.config, profile)
+    app.config['DB_PROFILE'] = profile or 'auto'
+    logger.info(f"Using database engine profile: {profile or 'default'}")
+    return profile
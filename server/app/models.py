@@ -45,9 +45,13 @@ class Agreement(db.Model):
 
 class AgreementDate(db.Model):
     __tablename__ = 'agreement_dates'
+    __table_args__ = (
+        # Serves "deadlines of type X in the next N days" without scanning every date
+        db.Index('ix_agreement_dates_type_value', 'date_type', 'date_value'),
+    )
     
     id = db.Column(db.String(36), primary_key=True, default=generate_uuid)
-    agreement_id = db.Column(db.String(36), db.ForeignKey('agreements.id'), nullable=False)
+    agreement_id = db.Column(db.String(36), db.ForeignKey('agreements.id'), nullable=False, index=True)
     date_type = db.Column(db.String(50), nullable=False)  # 'renewal_date', 'notice_deadline', 'expiration_date'
     date_value = db.Column(db.Date, nullable=False)
     description = db.Column(db.Text)
@@ -70,7 +74,7 @@ class Product(db.Model):
     __tablename__ = 'products'
     
     id = db.Column(db.String(36), primary_key=True, default=generate_uuid)
-    agreement_id = db.Column(db.String(36), db.ForeignKey('agreements.id'), nullable=False)
+    agreement_id = db.Column(db.String(36), db.ForeignKey('agreements.id'), nullable=False, index=True)
     product_name = db.Column(db.String(255))
     quantity = db.Column(db.Integer)
     unit_price = db.Column(db.Numeric(12, 2))
@@ -80,9 +84,13 @@ class Product(db.Model):
 
 class RenewalTerm(db.Model):
     __tablename__ = 'renewal_terms'
+    __table_args__ = (
+        db.Index('ix_renewal_terms_auto_renewal_agreement', 'auto_renewal', 'agreement_id'),
+    )
     
     id = db.Column(db.String(36), primary_key=True, default=generate_uuid)
-    agreement_id = db.Column(db.String(36), db.ForeignKey('agreements.id'), nullable=False)
+    # One set of renewal terms per agreement; the unique index also serves lookups by agreement
+    agreement_id = db.Column(db.String(36), db.ForeignKey('agreements.id'), nullable=False, unique=True)
     auto_renewal = db.Column(db.Boolean, default=False)
     notice_period_days = db.Column(db.Integer)
     notice_description = db.Column(db.Text)
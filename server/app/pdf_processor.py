@@ -1,34 +1,179 @@
 import pdfplumber
+import hashlib
 import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 
 logger = logging.getLogger(__name__)
 
-def process_pdf(filepath):
-    """Extract text from PDF using pdfplumber"""
+DEFAULT_OCR_WORKERS = 2
+
+# One OCR pool per server process, created on the first scanned upload and reused after that
+_executor = None
+_executor_lock = threading.Lock()
+
+def _get_executor(workers):
+    """Return the shared OCR pool, creating it with `workers` processes on first use"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # Spawn rather than fork: uploads arrive on request threads of a threaded server
+            _executor = ProcessPoolExecutor(max_workers=workers or DEFAULT_OCR_WORKERS,
+                                            mp_context=multiprocessing.get_context('spawn'))
+        return _executor
+
+def _discard_executor():
+    """Drop a broken pool so the next upload starts a fresh one"""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+def process_pdf(filepath, ocr_enabled=True, ocr_workers=None, ocr_resolution=300,
+                ocr_cache_folder=None, ocr_lang='eng'):
+    """Extract text from PDF using pdfplumber, falling back to OCR for scanned pages"""
     try:
-        text_content = []
-        
+        page_content = {}
+        image_only_pages = []
+
         with pdfplumber.open(filepath) as pdf:
             for page_num, page in enumerate(pdf.pages):
+                lines = []
+
                 # Extract text
                 text = page.extract_text()
-                if text:
-                    text_content.append(f"--- Page {page_num + 1} ---")
-                    text_content.append(text)
-                
+                if text and text.strip():
+                    lines.append(f"--- Page {page_num + 1} ---")
+                    lines.append(text)
+                elif page.images:
+                    # No text layer but the page carries images: a scanned page
+                    image_only_pages.append(page_num)
+
                 # Extract tables if any
                 tables = page.extract_tables()
                 for table_num, table in enumerate(tables):
-                    text_content.append(f"--- Table {table_num + 1} on Page {page_num + 1} ---")
+                    lines.append(f"--- Table {table_num + 1} on Page {page_num + 1} ---")
                     for row in table:
                         if row:
-                            text_content.append(" | ".join(str(cell) if cell else "" for cell in row))
-        
+                            lines.append(" | ".join(str(cell) if cell else "" for cell in row))
+
+                page_content[page_num] = lines
+
+        if image_only_pages and ocr_enabled:
+            ocr_text = ocr_pages(filepath, image_only_pages, workers=ocr_workers,
+                                 resolution=ocr_resolution, cache_folder=ocr_cache_folder,
+                                 lang=ocr_lang)
+            for page_num, text in ocr_text.items():
+                if text.strip():
+                    page_content[page_num][:0] = [f"--- Page {page_num + 1} (OCR) ---", text]
+
+        text_content = []
+        for page_num in sorted(page_content):
+            text_content.extend(page_content[page_num])
+
         full_text = "\\n".join(text_content)
-        logger.info(f"Extracted {len(full_text)} characters from PDF")
-        
+        logger.info(f"Extracted {len(full_text)} characters from PDF "
+                    f"({len(image_only_pages)} image-only pages)")
+
         return full_text
-        
+
     except Exception as e:
         logger.error(f"Error processing PDF {filepath}: {str(e)}")
-        raise
\ No newline at end of file
+        raise
+
+def ocr_pages(filepath, page_numbers, workers=None, resolution=300, cache_folder=None, lang='eng'):
+    """OCR the given pages across the shared process pool, returning {page_num: text}.
+
+    `workers` sizes the pool when it is first created; later calls reuse it.
+    """
+    try:
+        import pytesseract
+    except ImportError:
+        logger.warning("pytesseract is not installed, skipping OCR for image-only pages")
+        return {}
+
+    # Probe the binary once here rather than failing in every worker
+    try:
+        pytesseract.get_tesseract_version()
+    except Exception as e:
+        logger.warning(f"Tesseract is not available, skipping OCR for image-only pages: {str(e)}")
+        return {}
+
+    started = time.perf_counter()
+    jobs = [(filepath, page_num, resolution, cache_folder, lang) for page_num in page_numbers]
+
+    try:
+        if cache_folder:
+            os.makedirs(cache_folder, exist_ok=True)
+
+        # A single page is not worth a round trip through the pool
+        if len(jobs) == 1 or workers == 1:
+            results = [_ocr_page(*job) for job in jobs]
+        else:
+            results = list(_get_executor(workers).map(_ocr_page, *zip(*jobs)))
+    except Exception as e:
+        if isinstance(e, BrokenProcessPool):
+            _discard_executor()
+        logger.warning(f"OCR pool failed, continuing without OCR text: {str(e)}")
+        return {}
+
+    ocr_text = {}
+    for page_num, text, timings in results:
+        ocr_text[page_num] = text
+        if timings['error']:
+            logger.warning(f"OCR failed for page {page_num + 1}, skipping it: {timings['error']}")
+            continue
+        logger.info(f"OCR page {page_num + 1}: rasterize={timings['rasterize']:.3f}s "
+                    f"ocr={timings['ocr']:.3f}s cached={timings['cached']}")
+
+    logger.info(f"OCR of {len(jobs)} pages took {time.perf_counter() - started:.3f}s "
+                f"(workers={workers or DEFAULT_OCR_WORKERS})")
+    return ocr_text
+
+def _ocr_page(filepath, page_num, resolution, cache_folder, lang):
+    """Rasterize and OCR one page. Runs in a worker process.
+
+    Never raises: a page that cannot be rendered or read comes back as ''
+    with the reason in timings['error'], so one bad page doesn't fail the upload.
+    """
+    timings = {'rasterize': 0.0, 'ocr': 0.0, 'cached': False, 'error': None}
+
+    try:
+        import pytesseract
+
+        started = time.perf_counter()
+        with pdfplumber.open(filepath) as pdf:
+            image = pdf.pages[page_num].to_image(resolution=resolution).original
+        timings['rasterize'] = time.perf_counter() - started
+
+        cache_path = None
+        if cache_folder:
+            digest = hashlib.sha256(image.tobytes())
+            digest.update(f"{image.size}:{image.mode}:{lang}".encode())
+            cache_path = os.path.join(cache_folder, f"{digest.hexdigest()}.txt")
+            if os.path.exists(cache_path):
+                with open(cache_path, encoding='utf-8') as f:
+                    timings['cached'] = True
+                    return page_num, f.read(), timings
+
+        started = time.perf_counter()
+        text = pytesseract.image_to_string(image, lang=lang)
+        timings['ocr'] = time.perf_counter() - started
+
+        if cache_path:
+            # Write then rename so concurrent workers never read a partial file
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(text)
+            os.replace(tmp_path, cache_path)
+
+        return page_num, text, timings
+
+    except Exception as e:
+        timings['error'] = f"{type(e).__name__}: {str(e)}"
+        return page_num, '', timings
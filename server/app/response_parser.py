@@ -0,0 +1,356 @@
+import json
+import re
+import logging
+from dateutil import parser
+
+logger = logging.getLogger(__name__)
+
+DATE_TYPES = {'renewal_date', 'notice_deadline', 'expiration_date'}
+
+FENCE_PATTERN = re.compile(r"```(?:json)?\s*(.*?)(?:```|$)", re.DOTALL | re.IGNORECASE)
+
+_CLOSERS = {'{': '}', '[': ']'}
+
+def extract_json_text(text):
+    """Pull the JSON object out of a fenced or otherwise noisy LLM response"""
+    if not text:
+        return ''
+
+    fenced = FENCE_PATTERN.search(text)
+    if fenced and '{' in fenced.group(1):
+        text = fenced.group(1)
+
+    start = text.find('{')
+    if start == -1:
+        return ''
+    return text[start:]
+
+def clean_json_text(text):
+    """Strip // and /* */ comments and trailing commas outside of strings"""
+    out = []
+    i = 0
+    in_string = False
+
+    while i < len(text):
+        char = text[i]
+
+        if in_string:
+            out.append(char)
+            if char == '\\' and i + 1 < len(text):
+                out.append(text[i + 1])
+                i += 1
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+            out.append(char)
+        elif text.startswith('//', i):
+            newline = text.find('\n', i)
+            i = len(text) if newline == -1 else newline
+            continue
+        elif text.startswith('/*', i):
+            end = text.find('*/', i + 2)
+            i = len(text) if end == -1 else end + 2
+            continue
+        elif char in '}]':
+            # Drop a dangling comma before the closing bracket
+            while out and out[-1].isspace():
+                out.pop()
+            if out and out[-1] == ',':
+                out.pop()
+            out.append(char)
+        else:
+            out.append(char)
+        i += 1
+
+    return ''.join(out)
+
+def repair_truncated_json(text):
+    """Recover the longest parseable prefix of a truncated JSON document.
+
+    Walks the text once, recording every point where the value could be cut
+    cleanly (after an opening bracket, after each complete value, before a
+    comma, after a closing bracket) together with the brackets still open
+    there. Candidates are then tried from the longest prefix back, closing the
+    open brackets each time, so a response cut off mid-array keeps every
+    complete element before the break. Unterminated strings, numbers or
+    literals with no delimiter after them (a cut "12" may have been "1250")
+    and object keys without a value are always dropped.
+    """
+    stack = []
+    safe_points = []
+    in_string = False
+    string_is_key = False
+    escaped = False
+    expect_key = False
+    in_scalar = False
+
+    for i, char in enumerate(text):
+        if in_scalar and (char.isspace() or char in ',}]'):
+            # A number or true/false/null only counts as complete once a delimiter follows it
+            in_scalar = False
+            safe_points.append((i, list(stack)))
+
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == '"':
+                in_string = False
+                if not string_is_key:
+                    safe_points.append((i + 1, list(stack)))
+            continue
+
+        if char == '"':
+            in_string = True
+            string_is_key = expect_key
+        elif char in '{[':
+            stack.append(char)
+            expect_key = char == '{'
+            safe_points.append((i + 1, list(stack)))
+        elif char in '}]':
+            if not stack:
+                break
+            stack.pop()
+            expect_key = False
+            safe_points.append((i + 1, list(stack)))
+            if not stack:
+                # Complete document, anything after it is noise
+                try:
+                    return json.loads(text[:i + 1])
+                except ValueError:
+                    break
+        elif char == ',' and stack:
+            expect_key = stack[-1] == '{'
+            safe_points.append((i, list(stack)))
+        elif char == ':':
+            expect_key = False
+        elif not char.isspace() and stack:
+            in_scalar = True
+
+    for cut, open_brackets in reversed(safe_points):
+        candidate = text[:cut] + ''.join(_CLOSERS[b] for b in reversed(open_brackets))
+        try:
+            return json.loads(candidate)
+        except ValueError:
+            continue
+
+    raise ValueError('Could not repair truncated JSON')
+
+def _top_level_starts(text):
+    """Positions of each '{' that is not nested inside an earlier, still open object"""
+    starts = []
+    depth = 0
+    in_string = False
+    escaped = False
+
+    for i, char in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"' and depth:
+            in_string = True
+        elif char == '{':
+            if not depth:
+                starts.append(i)
+            depth += 1
+        elif char == '}' and depth:
+            depth -= 1
+    return starts
+
+def parse_json_response(text):
+    """Parse an LLM response into a dict, repairing it where possible"""
+    candidate = extract_json_text(text)
+    if not candidate:
+        raise ValueError('No JSON object found in response')
+
+    # Prose before the JSON may carry braces of its own, so try every top-level '{' and keep the first object
+    starts = _top_level_starts(candidate)
+    decoder = json.JSONDecoder()
+    for clean in (False, True):
+        for start in starts:
+            text = clean_json_text(candidate[start:]) if clean else candidate[start:]
+            try:
+                data, _ = decoder.raw_decode(text)
+            except ValueError:
+                continue
+            if isinstance(data, dict):
+                return data
+
+    logger.warning("AI response is not valid JSON, attempting repair")
+    repaired = None
+    for start in starts:
+        try:
+            data = repair_truncated_json(clean_json_text(candidate[start:]))
+        except ValueError:
+            continue
+        if isinstance(data, dict) and data:
+            return data
+        if isinstance(data, dict) and repaired is None:
+            repaired = data
+
+    if repaired is None:
+        raise ValueError('Could not parse a JSON object from response')
+    return repaired
+
+def _to_text(value):
+    if not isinstance(value, str) or not value.strip():
+        raise ValueError('expected non-empty string')
+    return value.strip()
+
+def _to_date(value):
+    if not isinstance(value, str):
+        raise ValueError('expected date string')
+    return parser.parse(value).date()
+
+def _to_positive_int(value):
+    if isinstance(value, bool):
+        raise ValueError('expected integer')
+    number = int(float(value))
+    if number < 1:
+        raise ValueError('expected positive integer')
+    return number
+
+def _to_non_negative_int(value):
+    if isinstance(value, bool):
+        raise ValueError('expected integer')
+    number = int(float(value))
+    if number < 0:
+        raise ValueError('expected non-negative integer')
+    return number
+
+def _to_bool(value):
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str) and value.strip().lower() in ('true', 'yes'):
+        return True
+    if isinstance(value, str) and value.strip().lower() in ('false', 'no'):
+        return False
+    raise ValueError('expected boolean')
+
+def _optional(convert, value):
+    return convert(value) if value is not None else None
+
+def _to_amount(value):
+    if isinstance(value, bool):
+        raise ValueError('expected number')
+    if isinstance(value, str):
+        value = re.sub(r'[^\d.\-]', '', value)
+    amount = float(value)
+    if amount < 0:
+        raise ValueError('expected non-negative amount')
+    return amount
+
+def _to_important_date(value):
+    if not isinstance(value, dict):
+        raise ValueError('expected object')
+    if value.get('type') not in DATE_TYPES:
+        raise ValueError(f"unknown date type {value.get('type')!r}")
+
+    return {
+        'type': value['type'],
+        'date': _to_date(value.get('date')),
+        'description': value.get('description') if isinstance(value.get('description'), str) else None,
+        'is_recurring': _optional(_to_bool, value.get('is_recurring')) or False,
+        'recurrence_interval_months': _optional(_to_positive_int, value.get('recurrence_interval_months'))
+    }
+
+def _to_important_dates(value):
+    if not isinstance(value, list):
+        raise ValueError('expected array')
+
+    dates = []
+    for item in value:
+        try:
+            dates.append(_to_important_date(item))
+        except (ValueError, TypeError, OverflowError) as e:
+            logger.warning(f"Dropping invalid important date {item!r}: {str(e)}")
+    return dates
+
+def _to_renewal_terms(value):
+    if not isinstance(value, dict):
+        raise ValueError('expected object')
+
+    # Each sub-field stands alone: one bad value becomes None instead of dropping the whole object
+    terms = {}
+    for field, convert in (('auto_renewal', _to_bool),
+                           ('notice_period_days', _to_non_negative_int),
+                           ('notice_description', _to_text)):
+        try:
+            terms[field] = _optional(convert, value.get(field))
+        except (ValueError, TypeError, OverflowError) as e:
+            logger.warning(f"Dropping invalid renewal_terms.{field}={value.get(field)!r}: {str(e)}")
+            terms[field] = None
+    return terms
+
+def _to_product(value):
+    if not isinstance(value, dict):
+        raise ValueError('expected object')
+
+    return {
+        'product_name': _to_text(value.get('product_name')),
+        'quantity': _optional(_to_positive_int, value.get('quantity')),
+        'unit_price': _optional(_to_amount, value.get('unit_price')),
+        'total_price': _optional(_to_amount, value.get('total_price')),
+        'term_months': _optional(_to_positive_int, value.get('term_months'))
+    }
+
+def _to_products(value):
+    if not isinstance(value, list):
+        raise ValueError('expected array')
+
+    products = []
+    for item in value:
+        try:
+            products.append(_to_product(item))
+        except (ValueError, TypeError, OverflowError) as e:
+            logger.warning(f"Dropping invalid product {item!r}: {str(e)}")
+    return products
+
+# Field name -> converter. Converters raise ValueError/TypeError on bad input.
+AGREEMENT_SCHEMA = {
+    'vendor': _to_text,
+    'buyer': _to_text,
+    'order_date': _to_date,
+    'effective_date': _to_date,
+    'end_date': _to_date,
+    'term_length_months': _to_positive_int,
+    'total_value': _to_amount,
+    'important_dates': _to_important_dates,
+    'renewal_terms': _to_renewal_terms,
+    'products': _to_products,
+}
+
+def validate_agreement_data(data, schema=AGREEMENT_SCHEMA):
+    """Validate extracted fields against the schema.
+
+    Returns (valid, missing): valid holds the converted fields that passed,
+    missing lists the fields that were absent or failed validation. A field
+    the model explicitly returned as null is treated as answered and is not
+    reported as missing.
+    """
+    valid = {}
+    missing = []
+
+    for field, convert in schema.items():
+        if field not in data:
+            missing.append(field)
+            continue
+
+        value = data[field]
+        if value is None:
+            valid[field] = None
+            continue
+
+        try:
+            valid[field] = convert(value)
+        except (ValueError, TypeError, OverflowError) as e:
+            logger.warning(f"Dropping invalid field {field}={value!r}: {str(e)}")
+            missing.append(field)
+
+    return valid, missing
@@ -1,18 +1,32 @@
 from flask import Blueprint, request, jsonify, current_app
-from werkzeug.utils import secure_filename
 from app import db
-from app.models import Agreement, AgreementDate
-from app.pdf_processor import process_pdf
-from app.ai_extractor import extract_agreement_data
-import os
+from app.models import Agreement, AgreementDate, RenewalTerm
 from datetime import datetime, timedelta
 
 bp = Blueprint('main', __name__)
+# Mutating agreement routes, registered only in 'full' mode
+edit_bp = Blueprint('edit', __name__)
 
-ALLOWED_EXTENSIONS = {'pdf'}
+DEFAULT_NOTICE_DAYS = 90
 
-def allowed_file(filename):
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+def calculate_notice_deadline(agreement, notice_days):
+    """Notice deadline entry for an agreement, or None if it has no end date or the deadline precedes its start"""
+    if not agreement.end_date:
+        return None
+    
+    notice_date = agreement.end_date - timedelta(days=notice_days)
+    
+    # Only add notice deadline if it's in the future relative to effective date
+    if agreement.effective_date and notice_date <= agreement.effective_date:
+        return None
+    
+    return {
+        'type': 'notice_deadline',
+        'date': notice_date,
+        'description': f'{agreement.vendor} renewal notice deadline ({notice_days} days before expiration)',
+        'is_recurring': False,
+        'recurrence_interval_months': None
+    }
 
 def calculate_important_dates(agreement):
     """Calculate important dates based on agreement terms"""
@@ -39,19 +53,14 @@ def calculate_important_dates(agreement):
         'recurrence_interval_months': agreement.term_length_months or 12
     })
     
-    # Calculate notice deadline (assume 90 days before expiration if not specified)
-    notice_days = 90  # Default notice period
-    notice_date = agreement.end_date - timedelta(days=notice_days)
-    
-    # Only add notice deadline if it's in the future relative to effective date
-    if not agreement.effective_date or notice_date > agreement.effective_date:
-        important_dates.append({
-            'type': 'notice_deadline',
-            'date': notice_date,
-            'description': f'{agreement.vendor} renewal notice deadline ({notice_days} days before expiration)',
-            'is_recurring': False,
-            'recurrence_interval_months': None
-        })
+    # Calculate notice deadline from the contract's notice period (90 days if not specified)
+    renewal_term = RenewalTerm.query.filter_by(agreement_id=agreement.id).first()
+    notice_days = DEFAULT_NOTICE_DAYS
+    if renewal_term and renewal_term.notice_period_days is not None:
+        notice_days = renewal_term.notice_period_days
+    notice_deadline = calculate_notice_deadline(agreement, notice_days)
+    if notice_deadline:
+        important_dates.append(notice_deadline)
     
     return important_dates
 
@@ -85,81 +94,6 @@ def update_agreement_dates(agreement):
 def health_check():
     return jsonify({'status': 'healthy', 'timestamp': datetime.utcnow().isoformat()})
 
-@bp.route('/upload', methods=['POST'])
-def upload_pdf():
-    try:
-        if 'file' not in request.files:
-            return jsonify({'error': 'No file provided'}), 400
-        
-        file = request.files['file']
-        if file.filename == '':
-            return jsonify({'error': 'No file selected'}), 400
-        
-        if not allowed_file(file.filename):
-            return jsonify({'error': 'File type not allowed. Please upload a PDF.'}), 400
-        
-        # Save file
-        filename = secure_filename(file.filename)
-        filepath = os.path.join(current_app.config['UPLOAD_FOLDER'], filename)
-        os.makedirs(current_app.config['UPLOAD_FOLDER'], exist_ok=True)
-        file.save(filepath)
-        
-        # Process PDF
-        raw_text = process_pdf(filepath)
-        
-        # Extract data using AI
-        extracted_data = extract_agreement_data(raw_text)
-        
-        # Save to database
-        agreement = Agreement(
-            filename=filename,
-            vendor=extracted_data.get('vendor'),
-            buyer=extracted_data.get('buyer'),
-            order_date=extracted_data.get('order_date'),
-            effective_date=extracted_data.get('effective_date'),
-            end_date=extracted_data.get('end_date'),
-            term_length_months=extracted_data.get('term_length_months'),
-            total_value=extracted_data.get('total_value'),
-            raw_text=raw_text
-        )
-        
-        db.session.add(agreement)
-        db.session.flush()  # Get the ID
-        
-        # Add extracted dates (prefer AI-extracted dates if available)
-        ai_dates = extracted_data.get('important_dates', [])
-        if ai_dates:
-            # Use AI-extracted dates
-            for date_info in ai_dates:
-                agreement_date = AgreementDate(
-                    agreement_id=agreement.id,
-                    date_type=date_info['type'],
-                    date_value=date_info['date'],
-                    description=date_info.get('description'),
-                    is_recurring=date_info.get('is_recurring', False),
-                    recurrence_interval_months=date_info.get('recurrence_interval_months')
-                )
-                db.session.add(agreement_date)
-        else:
-            # Fallback to calculated dates
-            update_agreement_dates(agreement)
-        
-        db.session.commit()
-        
-        # Clean up file
-        os.remove(filepath)
-        
-        return jsonify({
-            'message': 'PDF processed successfully',
-            'agreement_id': agreement.id,
-            'agreement': agreement.to_dict()
-        }), 201
-        
-    except Exception as e:
-        db.session.rollback()
-        current_app.logger.error(f"Upload error: {str(e)}")
-        return jsonify({'error': 'Failed to process PDF'}), 500
-
 @bp.route('/agreements', methods=['GET'])
 def get_agreements():
     try:
@@ -235,7 +169,54 @@ def get_upcoming_dates():
         current_app.logger.error(f"Upcoming dates error: {str(e)}")
         return jsonify({'error': 'Failed to fetch upcoming dates'}), 500
 
-@bp.route('/agreements/<agreement_id>', methods=['DELETE'])
+@bp.route('/calendar/notice-deadlines', methods=['GET'])
+def get_notice_deadlines():
+    """Get notice deadlines for auto-renewing agreements closing in the next N days"""
+    try:
+        try:
+            days = int(request.args.get('days', DEFAULT_NOTICE_DAYS))
+        except (ValueError, TypeError):
+            return jsonify({'error': 'days must be an integer'}), 400
+        if days < 0:
+            return jsonify({'error': 'days must be non-negative'}), 400
+        
+        today = datetime.now().date()
+        future_date = today + timedelta(days=days)
+        
+        # Reads the stored deadlines via the (date_type, date_value) index instead of recomputing them
+        query = db.session.query(AgreementDate, Agreement, RenewalTerm).join(
+            Agreement, AgreementDate.agreement_id == Agreement.id
+        ).join(
+            RenewalTerm, RenewalTerm.agreement_id == Agreement.id
+        ).filter(
+            AgreementDate.date_type == 'notice_deadline',
+            AgreementDate.date_value.between(today, future_date),
+            RenewalTerm.auto_renewal.is_(True)
+        ).order_by(AgreementDate.date_value)
+        
+        results = query.all()
+        
+        notice_deadlines = []
+        for agreement_date, agreement, renewal_term in results:
+            notice_deadlines.append({
+                'id': agreement_date.id,
+                'date': agreement_date.date_value.isoformat(),
+                'description': agreement_date.description,
+                'vendor': agreement.vendor,
+                'filename': agreement.filename,
+                'agreement_id': agreement.id,
+                'end_date': agreement.end_date.isoformat() if agreement.end_date else None,
+                'notice_period_days': renewal_term.notice_period_days,
+                'days_until': (agreement_date.date_value - today).days
+            })
+        
+        return jsonify(notice_deadlines)
+        
+    except Exception as e:
+        current_app.logger.error(f"Notice deadlines error: {str(e)}")
+        return jsonify({'error': 'Failed to fetch notice deadlines'}), 500
+
+@edit_bp.route('/agreements/<agreement_id>', methods=['DELETE'])
 def delete_agreement(agreement_id):
     """Delete an agreement and all its associated data"""
     try:
@@ -261,7 +242,7 @@ def delete_agreement(agreement_id):
         current_app.logger.error(f"Delete agreement error: {str(e)}")
         return jsonify({'error': 'Failed to delete agreement'}), 500
 
-@bp.route('/agreements/<agreement_id>', methods=['PUT'])
+@edit_bp.route('/agreements/<agreement_id>', methods=['PUT'])
 def update_agreement(agreement_id):
     """Update an agreement's details and sync calendar events"""
     try:
@@ -327,6 +308,28 @@ def update_agreement(agreement_id):
         if 'currency' in data:
             agreement.currency = data['currency']
         
+        if 'notice_period_days' in data or 'auto_renewal' in data:
+            renewal_term = RenewalTerm.query.filter_by(agreement_id=agreement.id).first()
+            if not renewal_term:
+                renewal_term = RenewalTerm(agreement_id=agreement.id)
+                db.session.add(renewal_term)
+            
+            if 'auto_renewal' in data:
+                if not isinstance(data['auto_renewal'], bool):
+                    return jsonify({'error': 'auto_renewal must be true or false'}), 400
+                renewal_term.auto_renewal = data['auto_renewal']
+            
+            if 'notice_period_days' in data:
+                try:
+                    new_notice_days = int(data['notice_period_days'])
+                    if new_notice_days < 0:
+                        return jsonify({'error': 'Notice period must be non-negative'}), 400
+                    if new_notice_days != renewal_term.notice_period_days:
+                        renewal_term.notice_period_days = new_notice_days
+                        dates_changed = True
+                except (ValueError, TypeError):
+                    return jsonify({'error': 'Invalid notice_period_days'}), 400
+        
         # Validate that end_date is after effective_date
         if agreement.effective_date and agreement.end_date:
             if agreement.end_date <= agreement.effective_date:
@@ -0,0 +1,117 @@
+from flask import Blueprint, request, jsonify, current_app
+from werkzeug.utils import secure_filename
+from app import db
+from app.models import Agreement, AgreementDate, Product, RenewalTerm
+from sqlalchemy import insert
+from app.routes import calculate_notice_deadline, update_agreement_dates
+import os
+
+bp = Blueprint('upload', __name__)
+
+ALLOWED_EXTENSIONS = {'pdf'}
+
+def allowed_file(filename):
+    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+
+@bp.route('/upload', methods=['POST'])
+def upload_pdf():
+    try:
+        if 'file' not in request.files:
+            return jsonify({'error': 'No file provided'}), 400
+        
+        file = request.files['file']
+        if file.filename == '':
+            return jsonify({'error': 'No file selected'}), 400
+        
+        if not allowed_file(file.filename):
+            return jsonify({'error': 'File type not allowed. Please upload a PDF.'}), 400
+        
+        # Save file
+        filename = secure_filename(file.filename)
+        filepath = os.path.join(current_app.config['UPLOAD_FOLDER'], filename)
+        os.makedirs(current_app.config['UPLOAD_FOLDER'], exist_ok=True)
+        file.save(filepath)
+        
+        # The extraction stack is heavy, so it is only imported once an upload arrives
+        from app.pdf_processor import process_pdf
+        from app.ai_extractor import extract_agreement_data
+        
+        # Process PDF
+        raw_text = process_pdf(
+            filepath,
+            ocr_enabled=current_app.config['OCR_ENABLED'],
+            ocr_workers=current_app.config['OCR_WORKERS'],
+            ocr_resolution=current_app.config['OCR_RESOLUTION'],
+            ocr_cache_folder=current_app.config['OCR_CACHE_FOLDER'],
+            ocr_lang=current_app.config['OCR_LANG']
+        )
+        
+        # Extract data using AI
+        extracted_data = extract_agreement_data(raw_text)
+        
+        # Save to database
+        agreement = Agreement(
+            filename=filename,
+            vendor=extracted_data.get('vendor'),
+            buyer=extracted_data.get('buyer'),
+            order_date=extracted_data.get('order_date'),
+            effective_date=extracted_data.get('effective_date'),
+            end_date=extracted_data.get('end_date'),
+            term_length_months=extracted_data.get('term_length_months'),
+            total_value=extracted_data.get('total_value'),
+            raw_text=raw_text
+        )
+        
+        db.session.add(agreement)
+        db.session.flush()  # Get the ID
+        
+        # Renewal terms must be in place before dates are calculated from them
+        renewal_terms = extracted_data.get('renewal_terms')
+        if renewal_terms:
+            db.session.execute(insert(RenewalTerm), [dict(renewal_terms, agreement_id=agreement.id)])
+        
+        products = extracted_data.get('products') or []
+        if products:
+            db.session.execute(insert(Product), [dict(product, agreement_id=agreement.id) for product in products])
+        
+        # Add extracted dates (prefer AI-extracted dates if available)
+        ai_dates = extracted_data.get('important_dates', [])
+        notice_days = (renewal_terms or {}).get('notice_period_days')
+        if ai_dates and notice_days is not None:
+            # A stated notice period wins over the model's own arithmetic, same rule as calculated dates
+            ai_dates = [date_info for date_info in ai_dates if date_info['type'] != 'notice_deadline']
+            notice_deadline = calculate_notice_deadline(agreement, notice_days)
+            if notice_deadline:
+                ai_dates.append(notice_deadline)
+        
+        if ai_dates:
+            # Use AI-extracted dates
+            for date_info in ai_dates:
+                agreement_date = AgreementDate(
+                    agreement_id=agreement.id,
+                    date_type=date_info['type'],
+                    date_value=date_info['date'],
+                    description=date_info.get('description'),
+                    is_recurring=date_info.get('is_recurring', False),
+                    recurrence_interval_months=date_info.get('recurrence_interval_months')
+                )
+                db.session.add(agreement_date)
+        else:
+            # Fallback to calculated dates
+            update_agreement_dates(agreement)
+        
+        db.session.commit()
+        
+        # Clean up file
+        os.remove(filepath)
+        
+        return jsonify({
+            'message': 'PDF processed successfully',
+            'agreement_id': agreement.id,
+            'agreement': agreement.to_dict()
+        }), 201
+        
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Upload error: {str(e)}")
+        return jsonify({'error': 'Failed to process PDF'}), 500
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Concurrency stress test for the database engine profile.
+
+Runs writer threads that insert agreements the way /upload does alongside
+reader threads hitting /calendar, then reports reader latency and lock
+errors. A second phase holds one large write transaction open, like an
+import chunk, and measures whether /calendar reads wait behind it. Each
+profile runs in its own subprocess against a fresh SQLite file.
+
+The baseline is SQLite's own behaviour without the profile: DELETE journal,
+synchronous=FULL, no mmap and pysqlite's default 5 s busy timeout.
+
+Exits non-zero if reads waited behind the held write in the tuned profile
+(or, with --single, in the current environment).
+
+    python bench_db_concurrency.py                 # compare tuned vs baseline SQLite
+    python bench_db_concurrency.py --single        # run once with the current env
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+
+PROFILES = {
+    'baseline': {'SQLITE_JOURNAL_MODE': 'DELETE', 'SQLITE_SYNCHRONOUS': 'FULL',
+                 'SQLITE_BUSY_TIMEOUT_MS': '5000', 'SQLITE_MMAP_SIZE': '0'},
+    'tuned': {},
+}
+
+def _p95(latencies):
+    latencies = sorted(latencies) or [0.0]
+    return latencies[int(len(latencies) * 0.95) - 1] if len(latencies) > 1 else latencies[0]
+
+def measure_held_write(app, readers, hold, rows, max_read_wait):
+    """Hold one write transaction open for `hold` seconds and time /calendar reads meanwhile.
+
+    Returns True if any read failed or took longer than max_read_wait seconds.
+    """
+    from sqlalchemy import insert
+    from app import db
+    from app.models import Agreement
+
+    holding = threading.Event()
+    done = threading.Event()
+    read_latencies = []
+    read_errors = []
+    lock = threading.Lock()
+
+    def writer():
+        with app.app_context():
+            # Large enough to spill past the page cache, like an import chunk of uploads with raw text
+            db.session.execute(insert(Agreement), [
+                {'filename': 'held.pdf', 'vendor': 'Held Vendor', 'raw_text': 'x' * 2000}
+                for _ in range(rows)
+            ])
+            holding.set()
+            time.sleep(hold)
+            db.session.commit()
+        done.set()
+
+    def reader():
+        client = app.test_client()
+        holding.wait()
+        while not done.is_set():
+            started = time.perf_counter()
+            response = client.get('/calendar')
+            elapsed = time.perf_counter() - started
+            with lock:
+                if response.status_code == 200:
+                    read_latencies.append(elapsed)
+                else:
+                    read_errors.append(elapsed)
+
+    threads = [threading.Thread(target=writer)]
+    threads += [threading.Thread(target=reader) for _ in range(readers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    worst = max(read_latencies + read_errors, default=0.0)
+    blocked = bool(read_errors) or worst > max_read_wait
+    print(f"  held write ({rows} rows, {hold:.1f}s): reads={len(read_latencies)} read_errors={len(read_errors)} "
+          f"read_p95={_p95(read_latencies) * 1000:.1f}ms read_max={worst * 1000:.1f}ms "
+          f"-> {'reads WAITED behind the writer' if blocked else 'reads did not wait'}")
+    return blocked
+
+def run_single(writers, readers, duration, hold, hold_rows, max_read_wait):
+    from app import create_app, db
+    from app.models import Agreement, AgreementDate
+
+    app = create_app()
+    app.logger.disabled = True  # lock errors are counted below, not logged
+    with app.app_context():
+        db.create_all()
+
+    stop = threading.Event()
+    read_latencies = []
+    counts = {'writes': 0, 'write_errors': 0, 'read_errors': 0}
+    lock = threading.Lock()
+
+    def writer():
+        while not stop.is_set():
+            with app.app_context():
+                try:
+                    agreement = Agreement(filename='bench.pdf', vendor='Bench Vendor',
+                                          effective_date=date.today(),
+                                          end_date=date.today() + timedelta(days=365))
+                    db.session.add(agreement)
+                    db.session.flush()
+                    for offset in (0, 90, 365):
+                        db.session.add(AgreementDate(agreement_id=agreement.id, date_type='renewal_date',
+                                                     date_value=date.today() + timedelta(days=offset)))
+                    # Hold the write transaction open briefly, like a slow upload
+                    time.sleep(0.01)
+                    db.session.commit()
+                    with lock:
+                        counts['writes'] += 1
+                except Exception:
+                    db.session.rollback()
+                    with lock:
+                        counts['write_errors'] += 1
+
+    def reader():
+        client = app.test_client()
+        while not stop.is_set():
+            started = time.perf_counter()
+            response = client.get('/calendar')
+            elapsed = time.perf_counter() - started
+            with lock:
+                if response.status_code == 200:
+                    read_latencies.append(elapsed)
+                else:
+                    counts['read_errors'] += 1
+
+    threads = [threading.Thread(target=writer) for _ in range(writers)]
+    threads += [threading.Thread(target=reader) for _ in range(readers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    print(f"journal_mode={app.config['SQLITE_JOURNAL_MODE']} busy_timeout={app.config['SQLITE_BUSY_TIMEOUT_MS']}ms")
+    print(f"  mixed load: writes={counts['writes']} write_errors={counts['write_errors']} "
+          f"reads={len(read_latencies)} read_errors={counts['read_errors']} "
+          f"read_p50={statistics.median(read_latencies or [0.0]) * 1000:.1f}ms "
+          f"read_p95={_p95(read_latencies) * 1000:.1f}ms")
+
+    return measure_held_write(app, readers, hold, hold_rows, max_read_wait)
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--writers', type=int, default=4)
+    arg_parser.add_argument('--readers', type=int, default=4)
+    arg_parser.add_argument('--duration', type=float, default=5.0)
+    arg_parser.add_argument('--hold', type=float, default=2.0, help='seconds to hold the large write transaction')
+    arg_parser.add_argument('--hold-rows', type=int, default=5000, help='rows written in the held transaction')
+    arg_parser.add_argument('--max-read-wait', type=float, default=0.5,
+                            help='slowest acceptable /calendar read, in seconds, while the write is held')
+    arg_parser.add_argument('--single', action='store_true', help='run once with the current environment')
+    args = arg_parser.parse_args()
+
+    if args.single:
+        blocked = run_single(args.writers, args.readers, args.duration,
+                             args.hold, args.hold_rows, args.max_read_wait)
+        sys.exit(1 if blocked else 0)
+
+    results = {}
+    for name, overrides in PROFILES.items():
+        with tempfile.TemporaryDirectory() as tmp:
+            env = dict(os.environ, **overrides)
+            env['DATABASE_URL'] = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+            print(f"[{name}] ", end='', flush=True)
+            results[name] = subprocess.run([
+                sys.executable, __file__, '--single', '--writers', str(args.writers),
+                '--readers', str(args.readers), '--duration', str(args.duration),
+                '--hold', str(args.hold), '--hold-rows', str(args.hold_rows),
+                '--max-read-wait', str(args.max_read_wait)
+            ], env=env).returncode
+
+    # Only the tuned profile is expected to keep reads flowing
+    sys.exit(results['tuned'])
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark for create_app.
+
+Times `create_app()` in fresh interpreters and fails if the median exceeds
+the target, or if the PDF/AI extraction stack was imported at startup.
+
+    python bench_import_time.py                    # full mode, default target
+    python bench_import_time.py --mode api --target 0.5
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+HEAVY_MODULES = ['pdfplumber', 'pdfminer', 'requests', 'dateutil', 'app.pdf_processor', 'app.ai_extractor']
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+from app import create_app
+create_app({mode!r})
+elapsed = time.perf_counter() - started
+print(json.dumps({{'elapsed': elapsed, 'loaded': [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--mode', choices=['full', 'api'], default='full')
+    arg_parser.add_argument('--runs', type=int, default=5)
+    arg_parser.add_argument('--target', type=float, default=1.0, help='maximum median cold start in seconds')
+    args = arg_parser.parse_args()
+
+    timings = []
+    loaded = set()
+    for _ in range(args.runs):
+        output = subprocess.run([sys.executable, '-c', PROBE.format(mode=args.mode, heavy=HEAVY_MODULES)],
+                                capture_output=True, text=True, check=True).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        timings.append(result['elapsed'])
+        loaded.update(result['loaded'])
+
+    median = statistics.median(timings)
+    print(f"mode={args.mode} runs={args.runs} median={median * 1000:.0f}ms "
+          f"min={min(timings) * 1000:.0f}ms max={max(timings) * 1000:.0f}ms target={args.target * 1000:.0f}ms")
+
+    failed = False
+    if loaded:
+        print(f"FAIL: extraction modules imported at startup: {sorted(loaded)}")
+        failed = True
+    if median > args.target:
+        print("FAIL: cold start is over target")
+        failed = True
+
+    sys.exit(1 if failed else 0)
+
+if __name__ == '__main__':
+    main()
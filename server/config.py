@@ -5,9 +5,30 @@ load_dotenv()
 
 class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY')
+    # 'full' serves everything; 'api' is read-only (GET routes only) and never loads the PDF/AI extraction stack
+    APP_MODE = os.environ.get('APP_MODE', 'full')
     # Use SQLite for local development, PostgreSQL for production
     SQLALCHEMY_DATABASE_URI = (os.environ.get('DATABASE_URL') or 'sqlite:///brm_calendar.db')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Engine tuning profile: 'auto' picks from the database URI, or force 'sqlite' / 'postgres'
+    DB_PROFILE = os.environ.get('DB_PROFILE', 'auto')
+    SQLITE_JOURNAL_MODE = os.environ.get('SQLITE_JOURNAL_MODE', 'WAL')
+    SQLITE_SYNCHRONOUS = os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL')
+    SQLITE_BUSY_TIMEOUT_MS = int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 5000))
+    SQLITE_MMAP_SIZE = int(os.environ.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))
+    PG_POOL_SIZE = int(os.environ.get('PG_POOL_SIZE', 10))
+    PG_MAX_OVERFLOW = int(os.environ.get('PG_MAX_OVERFLOW', 20))
+    PG_POOL_TIMEOUT = int(os.environ.get('PG_POOL_TIMEOUT', 30))
+    PG_POOL_RECYCLE = int(os.environ.get('PG_POOL_RECYCLE', 1800))
+    PG_POOL_PRE_PING = os.environ.get('PG_POOL_PRE_PING', 'true').lower() == 'true'
+    PG_STATEMENT_TIMEOUT_MS = int(os.environ.get('PG_STATEMENT_TIMEOUT_MS', 30000))
     UPLOAD_FOLDER = 'uploads'
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
     OPENROUTER_API_KEY = os.environ.get('OPENROUTER_API_KEY')
+    # OCR fallback for scanned (image-only) PDF pages
+    OCR_ENABLED = os.environ.get('OCR_ENABLED', 'true').lower() == 'true'
+    # Size of the per-process OCR pool; each worker holds a full-page image, so keep it small
+    OCR_WORKERS = max(1, int(os.environ.get('OCR_WORKERS', 2)))
+    OCR_RESOLUTION = int(os.environ.get('OCR_RESOLUTION', 300))
+    OCR_CACHE_FOLDER = os.environ.get('OCR_CACHE_FOLDER', 'ocr_cache')
+    OCR_LANG = os.environ.get('OCR_LANG', 'eng')
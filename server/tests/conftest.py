@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Let tests import the app package when pytest is run from the repo root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,144 @@
+from datetime import date
+
+import pytest
+
+from app.response_parser import (
+    parse_json_response,
+    repair_truncated_json,
+    validate_agreement_data,
+)
+
+def test_parses_plain_json():
+    assert parse_json_response('{"vendor": "Acme"}') == {'vendor': 'Acme'}
+
+def test_parses_fenced_json_with_surrounding_text():
+    text = 'Here is the data:\n```json\n{"vendor": "Acme"}\n```\nLet me know if you need more.'
+    assert parse_json_response(text) == {'vendor': 'Acme'}
+
+def test_ignores_trailing_text_after_object():
+    assert parse_json_response('{"vendor": "Acme"} Note: buyer not found') == {'vendor': 'Acme'}
+
+def test_strips_comments():
+    text = '{\n  "vendor": "Acme", // the seller\n  /* block */ "buyer": "Foo"\n}'
+    assert parse_json_response(text) == {'vendor': 'Acme', 'buyer': 'Foo'}
+
+def test_comment_markers_inside_strings_are_kept():
+    assert parse_json_response('{"url": "https://example.com", // x\n "a": 1}') == {
+        'url': 'https://example.com', 'a': 1
+    }
+
+def test_strips_trailing_commas():
+    text = '{"vendor": "Acme", "important_dates": [{"type": "renewal_date",},],}'
+    assert parse_json_response(text) == {'vendor': 'Acme', 'important_dates': [{'type': 'renewal_date'}]}
+
+def test_no_json_raises():
+    with pytest.raises(ValueError):
+        parse_json_response('I could not find any agreement data.')
+
+def test_non_object_raises():
+    with pytest.raises(ValueError):
+        parse_json_response('```json\n[1, 2]\n```')
+
+def test_truncated_mid_array_keeps_complete_elements():
+    text = ('{"vendor": "Acme", "important_dates": [{"type": "renewal_date", "date": "2027-01-15"}, '
+            '{"type": "notice_deadline", "da')
+    assert parse_json_response(text) == {
+        'vendor': 'Acme',
+        'important_dates': [{'type': 'renewal_date', 'date': '2027-01-15'}, {'type': 'notice_deadline'}],
+    }
+
+def test_truncated_mid_object_keeps_last_complete_value():
+    assert repair_truncated_json('{"vendor": "A", "buyer": "B"') == {'vendor': 'A', 'buyer': 'B'}
+    assert repair_truncated_json('{"products": [{"product_name": "X", "quantity": 2') == {
+        'products': [{'product_name': 'X'}]
+    }
+    assert repair_truncated_json('{"products": [{"product_name": "X", "quantity": 2 ') == {
+        'products': [{'product_name': 'X', 'quantity': 2}]
+    }
+
+def test_truncated_mid_key_drops_key():
+    assert repair_truncated_json('{"vendor": "A", "buy') == {'vendor': 'A'}
+    assert repair_truncated_json('{"vendor": "A", "buyer":') == {'vendor': 'A'}
+
+def test_truncated_mid_string_drops_partial_value():
+    assert repair_truncated_json('{"vendor": "A", "buyer": "Fo') == {'vendor': 'A'}
+
+def test_truncated_string_with_escaped_quote_and_brackets():
+    assert repair_truncated_json('{"a": "x\\" {", "b": [1, 2') == {'a': 'x" {', 'b': [1]}
+
+def test_truncated_partial_literal_is_dropped():
+    assert repair_truncated_json('{"vendor": "A", "auto": tru') == {'vendor': 'A'}
+
+def test_truncated_mid_number_is_dropped():
+    assert parse_json_response('{"vendor": "A", "total_value": 12') == {'vendor': 'A'}
+    assert parse_json_response('{"vendor": "A", "total_value": 12, "buy') == {'vendor': 'A', 'total_value': 12}
+
+def test_braces_in_preamble_are_skipped():
+    assert parse_json_response('Sure {see below}: {"a": 1}') == {'a': 1}
+    assert parse_json_response('Sure {see below}: {"a": 1, "b": "x') == {'a': 1}
+
+def test_validate_converts_fields():
+    valid, missing = validate_agreement_data({
+        'vendor': ' Acme ',
+        'end_date': '2026-01-01',
+        'term_length_months': '12',
+        'total_value': '$1,200.50',
+    })
+    assert valid['vendor'] == 'Acme'
+    assert valid['end_date'] == date(2026, 1, 1)
+    assert valid['term_length_months'] == 12
+    assert valid['total_value'] == 1200.5
+    assert 'buyer' in missing
+
+def test_validate_drops_bad_fields_one_at_a_time():
+    valid, missing = validate_agreement_data({
+        'vendor': 'Acme',
+        'buyer': '',
+        'end_date': 'not a date',
+        'term_length_months': -3,
+        'total_value': 500,
+    })
+    assert valid['vendor'] == 'Acme'
+    assert valid['total_value'] == 500.0
+    for field in ('buyer', 'end_date', 'term_length_months'):
+        assert field not in valid
+        assert field in missing
+
+def test_validate_null_counts_as_answered():
+    valid, missing = validate_agreement_data({'order_date': None})
+    assert valid['order_date'] is None
+    assert 'order_date' not in missing
+
+def test_validate_drops_bad_important_dates_individually():
+    valid, _ = validate_agreement_data({'important_dates': [
+        {'type': 'renewal_date', 'date': '2027-01-15', 'is_recurring': 'false'},
+        {'type': 'renewal_date'},
+        {'type': 'made_up', 'date': '2027-01-15'},
+        {'type': 'expiration_date', 'date': '2027-01-15', 'is_recurring': 'sometimes'},
+    ]})
+    assert valid['important_dates'] == [{
+        'type': 'renewal_date',
+        'date': date(2027, 1, 15),
+        'description': None,
+        'is_recurring': False,
+        'recurrence_interval_months': None,
+    }]
+
+def test_validate_renewal_terms_and_products():
+    valid, _ = validate_agreement_data({
+        'renewal_terms': {'auto_renewal': 'true', 'notice_period_days': 60},
+        'products': [{'product_name': 'Seats', 'quantity': 10, 'unit_price': '$50'}, {'quantity': 1}],
+    })
+    assert valid['renewal_terms'] == {'auto_renewal': True, 'notice_period_days': 60, 'notice_description': None}
+    assert valid['products'] == [{
+        'product_name': 'Seats', 'quantity': 10, 'unit_price': 50.0, 'total_price': None, 'term_months': None
+    }]
+
+def test_validate_renewal_terms_drops_only_bad_sub_fields():
+    valid, missing = validate_agreement_data({
+        'renewal_terms': {'auto_renewal': 'sometimes', 'notice_period_days': 30, 'notice_description': 'Email'},
+    })
+    assert 'renewal_terms' not in missing
+    assert valid['renewal_terms'] == {'auto_renewal': None, 'notice_period_days': 30, 'notice_description': 'Email'}
+    valid, _ = validate_agreement_data({'renewal_terms': {'auto_renewal': True, 'notice_period_days': 'soon'}})
+    assert valid['renewal_terms'] == {'auto_renewal': True, 'notice_period_days': None, 'notice_description': None}